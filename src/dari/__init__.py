@@ -1,6 +1,18 @@
 """Public interface for the Dari Python client."""
 
+from typing import Any
+
 from ._version import __version__
 from .client import Dari, DariError
 
+# AsyncDari is left out of __all__ so star-imports keep working without httpx.
 __all__ = ["Dari", "DariError", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    # AsyncDari pulls in the optional httpx dependency, so import it on first use.
+    if name == "AsyncDari":
+        from .aclient import AsyncDari
+
+        return AsyncDari
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
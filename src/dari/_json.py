@@ -0,0 +1,39 @@
+"""JSON helpers backed by :mod:`orjson` when it is installed."""
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["dumps", "loads"]
+
+
+def _default(obj: Any) -> Any:
+    # Payload values are passed through uncopied, so non-dict mappings land here.
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+
+else:  # pragma: no cover - exercised only without orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+
+        return json.dumps(obj, separators=(",", ":"), allow_nan=False, default=_default).encode("utf-8")
+
+    loads = json.loads
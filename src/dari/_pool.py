@@ -0,0 +1,101 @@
+"""Process-wide HTTP connection pools shared by :class:`~dari.Dari` clients."""
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Dict
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+__all__ = ["SharedConnectionPool"]
+
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 64
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER_MAX = 5  # seconds
+
+# Only idempotent methods are retried on error statuses. Retrying a POST could
+# start a workflow or purchase a phone number twice, and a PATCH that extends a
+# session's ttl could be applied again.
+_RETRY_METHODS = frozenset({"GET", "DELETE"})
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _CappedRetry(Retry):
+    """:class:`Retry` that honours ``Retry-After`` for at most a few seconds.
+
+    urllib3 would otherwise sleep for whatever the server asks (up to six hours
+    in 2.x, unbounded in 1.26), far beyond the client's own ``timeout``.
+    """
+
+    def get_retry_after(self, response):  # type: ignore[no-untyped-def]
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, DEFAULT_RETRY_AFTER_MAX)
+
+
+class _SharedHTTPAdapter(HTTPAdapter):
+    """Pooled adapter with backoff whose sockets outlive any single session."""
+
+    def __init__(self) -> None:
+        retry = _CappedRetry(
+            total=DEFAULT_MAX_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=_RETRY_METHODS,
+            raise_on_status=False,
+        )
+        super().__init__(
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+
+    def close(self) -> None:
+        # Session.close() closes every mounted adapter; other clients may still
+        # be using this one, so only SharedConnectionPool.shutdown() tears it down.
+        pass
+
+    def _shutdown(self) -> None:
+        super().close()
+
+
+class SharedConnectionPool:
+    """Registry of one :class:`HTTPAdapter` per API host for the whole process.
+
+    Every :class:`~dari.Dari` built without an explicit ``session`` mounts the
+    adapter for its ``base_url`` host, so clients created repeatedly (tests,
+    notebooks, per-tenant instances) reuse warm keep-alive sockets instead of
+    each opening their own.
+    """
+
+    _adapters: Dict[str, _SharedHTTPAdapter] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_adapter(cls, base_url: str) -> HTTPAdapter:
+        """Return the shared adapter for ``base_url``'s scheme and host."""
+
+        parts = urlsplit(base_url)
+        key = f"{parts.scheme}://{parts.netloc}".lower()
+        with cls._lock:
+            adapter = cls._adapters.get(key)
+            if adapter is None:
+                adapter = cls._adapters[key] = _SharedHTTPAdapter()
+            return adapter
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close every shared pool. Clients created afterwards start fresh ones."""
+
+        with cls._lock:
+            adapters = list(cls._adapters.values())
+            cls._adapters.clear()
+        for adapter in adapters:
+            adapter._shutdown()
+
+
+atexit.register(SharedConnectionPool.shutdown)
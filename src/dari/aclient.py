@@ -0,0 +1,422 @@
+"""Asynchronous HTTP client for the Dari public API."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+try:
+    import httpx
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise ImportError('AsyncDari requires httpx; install it with pip install "dari-python[async]"') from exc
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_H2 = False
+else:
+    _HAS_H2 = True
+
+from . import _json
+from ._version import __version__
+from .client import (
+    _JSON_HEADERS,
+    DEFAULT_BASE_URL,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_TIMEOUT,
+    DariError,
+    _compact,
+    _log_background_failure,
+    _parse_response,
+)
+
+__all__ = ["AsyncDari"]
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncDari:
+    """Asyncio counterpart of :class:`~dari.Dari` built on :class:`httpx.AsyncClient`.
+
+    The request methods mirror the synchronous client but must be awaited;
+    the streaming ``*_iter`` methods and :meth:`~dari.Dari.get_execution_details_many`
+    have no async counterpart (use :func:`asyncio.gather` instead). Requests
+    share one HTTP/2 connection pool, so concurrent calls issued with
+    :func:`asyncio.gather` are multiplexed instead of queued. HTTP/2 is used
+    when the ``h2`` package is installed and the server offers it, with
+    HTTP/1.1 keep-alive otherwise; pass ``http2=False`` to opt out.
+
+    Like :class:`~dari.Dari`, passing ``session_cache_ttl`` remembers sessions
+    by ID for that many seconds so :meth:`get_session` can answer locally.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: int | float = DEFAULT_TIMEOUT,
+        client: Optional[httpx.AsyncClient] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        http2: Optional[bool] = None,
+        session_cache_ttl: Optional[float] = None,
+    ) -> None:
+        if not api_key:
+            raise ValueError("api_key must be provided")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        default_headers: Dict[str, str] = {
+            "X-API-Key": api_key,
+            "User-Agent": f"dari-python/{__version__}",
+            "Accept": "application/json",
+        }
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=_HAS_H2 if http2 is None else http2,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=DEFAULT_MAX_CONNECTIONS,
+                    max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                headers=default_headers,
+            )
+            default_headers = {}
+        self._client = client
+        # As in Dari, a caller-supplied client is never modified; the defaults
+        # are sent with each request instead.
+        self._default_headers = default_headers
+        self._cache_size = cache_size
+        self._session_cache_ttl = session_cache_ttl
+        self._session_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._pending: "Set[asyncio.Task[Any]]" = set()
+
+    # ------------------------------------------------------------------
+    # Workflow execution helpers
+    # ------------------------------------------------------------------
+    async def start_workflow(
+        self,
+        workflow_id: str,
+        input_variables: Mapping[str, Any],
+        *,
+        timeout_minutes: Optional[int] = None,
+        should_update_cache: Optional[bool] = None,
+        allow_public_live_view: Optional[bool] = None,
+        browser_profile_id: Optional[str] = None,
+        use_proxy: Optional[bool] = None,
+        proxy_city: Optional[str] = None,
+        proxy_server: Optional[str] = None,
+        proxy_server_username: Optional[str] = None,
+        proxy_server_password: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Trigger a workflow execution; see :meth:`Dari.start_workflow`."""
+
+        payload: Dict[str, Any] = {
+            "input_variables": input_variables,
+            **_compact(
+                timeout_minutes=timeout_minutes,
+                should_update_cache=should_update_cache,
+                allow_public_live_view=allow_public_live_view,
+                browser_profile_id=browser_profile_id,
+                use_proxy=use_proxy,
+                proxy_city=proxy_city,
+                proxy_server=proxy_server,
+                proxy_server_username=proxy_server_username,
+                proxy_server_password=proxy_server_password,
+                user_agent=user_agent,
+            ),
+        }
+        return await self._request("POST", f"/public/workflows/start/{workflow_id}", json=payload)
+
+    async def list_workflow_executions(self, workflow_id: str) -> Dict[str, Any]:
+        """Return executions for the given workflow."""
+
+        return await self._request("GET", f"/public/workflows/{workflow_id}")
+
+    async def get_execution_details(self, workflow_id: str, execution_id: str) -> Dict[str, Any]:
+        """Fetch detailed information about a workflow execution."""
+
+        return await self._request("GET", f"/public/workflows/{workflow_id}/executions/{execution_id}")
+
+    async def resume_workflow(self, resume_url: str, variables: Mapping[str, Any]) -> Dict[str, Any]:
+        """Resume a paused workflow using the resume URL from a webhook payload."""
+
+        payload = {"variables": variables}
+        return await self._request("POST", resume_url, json=payload, require_api_key=False)
+
+    # ------------------------------------------------------------------
+    # Account metadata
+    # ------------------------------------------------------------------
+    async def list_credentials(self) -> Any:
+        """Return saved browser credentials."""
+
+        return await self._request("GET", "/public/credentials")
+
+    async def create_credential(
+        self,
+        *,
+        service_name: str,
+        username_or_email: Optional[str] = None,
+        password: Optional[str] = None,
+        totp_secret: Optional[str] = None,
+        gmail_oauth_account_id: Optional[str] = None,
+        phone_number_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a new credential with API key authentication."""
+
+        payload: Dict[str, Any] = {
+            "service_name": service_name,
+            **_compact(
+                username_or_email=username_or_email,
+                password=password,
+                totp_secret=totp_secret,
+                gmail_oauth_account_id=gmail_oauth_account_id,
+                phone_number_id=phone_number_id,
+            ),
+        }
+        return await self._request("POST", "/public/credentials", json=payload)
+
+    async def list_connected_accounts(self) -> Any:
+        """Return OAuth accounts associated with the workspace."""
+
+        return await self._request("GET", "/public/connected-accounts")
+
+    async def list_phone_numbers(self) -> Any:
+        """Return all phone numbers for the workspace."""
+
+        return await self._request("GET", "/public/phone-numbers")
+
+    async def purchase_phone_number(self, *, label: str) -> Dict[str, Any]:
+        """Purchase a new Twilio phone number for the workspace."""
+
+        payload = {"label": label}
+        return await self._request("POST", "/public/phone-numbers", json=payload)
+
+    async def create_browser_profile(
+        self,
+        *,
+        name: str,
+        provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a new browser profile; see :meth:`Dari.create_browser_profile`."""
+
+        payload: Dict[str, Any] = {"name": name, **_compact(provider=provider)}
+        return await self._request("POST", "/public/browser-profiles", json=payload)
+
+    async def list_browser_profiles(self) -> Dict[str, Any]:
+        """Return all browser profiles in the workspace."""
+
+        return await self._request("GET", "/public/browser-profiles")
+
+    # ------------------------------------------------------------------
+    # Computer use helpers
+    # ------------------------------------------------------------------
+    async def run_single_action(
+        self,
+        *,
+        action: str,
+        session_id: Optional[str] = None,
+        id: Optional[str] = None,
+        variables: Optional[Mapping[str, Any]] = None,
+        screen_config: Optional[Mapping[str, Any]] = None,
+        set_cache: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Execute a single action with the Computer Use agent; see :meth:`Dari.run_single_action`."""
+
+        payload: Dict[str, Any] = {
+            "action": action,
+            **_compact(
+                session_id=session_id,
+                id=id,
+                variables=variables,
+                screen_config=screen_config,
+                set_cache=set_cache,
+            ),
+        }
+        if session_id is not None:
+            self._session_cache.pop(session_id, None)
+        return await self._request("POST", "/public/single-actions/run-action", json=payload, timeout=120)
+
+    # ------------------------------------------------------------------
+    # Browser session management
+    # ------------------------------------------------------------------
+    async def create_session(
+        self,
+        *,
+        cdp_url: Optional[str] = None,
+        screen_config: Optional[Mapping[str, Any]] = None,
+        ttl: Optional[int] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Create a managed browser session; see :meth:`Dari.create_session`."""
+
+        payload = _compact(cdp_url=cdp_url, screen_config=screen_config, ttl=ttl, metadata=metadata)
+        return self._remember_session(await self._request("POST", "/public/sessions", json=payload))
+
+    async def get_session(self, session_id: str, *, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get details of a specific session; see :meth:`Dari.get_session`."""
+
+        if not force_refresh and self._session_cache_ttl:
+            entry = self._session_cache.get(session_id)
+            if entry is not None and entry[0] > time.monotonic():
+                return copy.deepcopy(entry[1])
+        return self._remember_session(await self._request("GET", f"/public/sessions/{session_id}"))
+
+    async def list_sessions(
+        self,
+        *,
+        status_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """List sessions; see :meth:`Dari.list_sessions`."""
+
+        params = _compact(status_filter=status_filter, limit=limit, offset=offset)
+        return await self._request("GET", "/public/sessions", params=params if params else None)
+
+    async def list_sessions_all(
+        self,
+        *,
+        status_filter: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Return every session, fetching the pages after the first concurrently.
+
+        The first page reports ``total``; the remaining pages are then requested
+        at once, with at most ``max_concurrency`` in flight. Sessions are
+        returned in listing order.
+        """
+
+        if page_size < 1 or max_concurrency < 1:
+            raise ValueError("page_size and max_concurrency must be positive")
+        first = await self.list_sessions(status_filter=status_filter, limit=page_size, offset=0)
+        sessions: List[Dict[str, Any]] = list(first.get("sessions") or [])
+        total = first.get("total") or 0
+        if not sessions or len(sessions) >= total:
+            return sessions
+        # The server may cap ``limit``; page by what it actually returned.
+        step = len(sessions)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(offset: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                page = await self.list_sessions(status_filter=status_filter, limit=step, offset=offset)
+            return page.get("sessions") or []
+
+        pages = await asyncio.gather(*(fetch(offset) for offset in range(step, total, step)))
+        for page in pages:
+            sessions.extend(page)
+        return sessions
+
+    async def update_session(
+        self,
+        session_id: str,
+        *,
+        ttl: Optional[int] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Update a session's TTL or metadata."""
+
+        payload = _compact(ttl=ttl, metadata=metadata)
+        if not payload:
+            raise ValueError("update_session requires ttl or metadata")
+        self._session_cache.pop(session_id, None)
+        return self._remember_session(await self._request("PATCH", f"/public/sessions/{session_id}", json=payload))
+
+    async def terminate_session(self, session_id: str, *, wait: bool = True) -> Optional["asyncio.Task[Any]"]:
+        """Terminate a session; see :meth:`Dari.terminate_session`.
+
+        With ``wait=False`` the request runs as a background task that is
+        returned immediately; :meth:`aclose` waits for it to finish. Failures
+        are logged to the ``dari.client`` logger and remain on the task.
+        """
+
+        self._session_cache.pop(session_id, None)
+        request = self._request("POST", f"/public/sessions/{session_id}/terminate")
+        if not wait:
+            task = asyncio.ensure_future(request)
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            task.add_done_callback(_log_background_failure)
+            return task
+        await request
+        return None
+
+    async def delete_session(self, session_id: str) -> None:
+        """Delete a session."""
+
+        self._session_cache.pop(session_id, None)
+        await self._request("DELETE", f"/public/sessions/{session_id}")
+
+    # ------------------------------------------------------------------
+    # Client helpers
+    # ------------------------------------------------------------------
+    async def aclose(self) -> None:
+        """Wait for background requests, then close the underlying :class:`httpx.AsyncClient`."""
+
+        if self._pending:
+            # Failures were already logged and stay on the tasks handed back to callers.
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncDari":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
+        await self.aclose()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _remember_session(self, session: Any) -> Any:
+        if self._session_cache_ttl and self._cache_size > 0 and isinstance(session, dict) and "session_id" in session:
+            entry = (time.monotonic() + self._session_cache_ttl, copy.deepcopy(session))
+            self._session_cache[session["session_id"]] = entry
+            self._session_cache.move_to_end(session["session_id"])
+            if len(self._session_cache) > self._cache_size:
+                self._session_cache.popitem(last=False)
+        return session
+
+    async def _request(
+        self,
+        method: str,
+        path_or_url: str,
+        *,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        require_api_key: bool = True,
+        timeout: Optional[int | float] = None,
+    ) -> Any:
+        if path_or_url.startswith(("http://", "https://")):
+            url = path_or_url
+        else:
+            url = f"{self.base_url}{path_or_url}"
+        headers: Mapping[str, str] = self._default_headers
+        body = None
+        if json is not None:
+            body = _json.dumps(json)
+            headers = {**headers, **_JSON_HEADERS}
+        request = self._client.build_request(
+            method,
+            url,
+            content=body,
+            params=params,
+            headers=headers or None,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        if not require_api_key:
+            request.headers.pop("X-API-Key", None)
+        try:
+            response = await self._client.send(request)
+        except httpx.HTTPError as exc:  # pragma: no cover - simple passthrough
+            raise DariError(str(exc)) from exc
+        if response.status_code >= 400:
+            raise DariError(status_code=response.status_code, response=response)
+        return _parse_response(response)
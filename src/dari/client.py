@@ -1,28 +1,138 @@
 """Lightweight HTTP client for the Dari public API."""
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, MutableMapping, Optional
+import copy
+import gzip
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple
 
 import requests
-from requests import Response, Session
+from requests import PreparedRequest, Response, Session
+from urllib3.exceptions import HTTPError as _Urllib3HTTPError
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None  # type: ignore[assignment]
+
+from . import _json
+from ._pool import SharedConnectionPool
 from ._version import __version__
 
+_logger = logging.getLogger(__name__)
+
 DEFAULT_BASE_URL = "https://api.usedari.com"
 DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_MAX_WORKERS = 16
+
+_PREPARED_CACHE_SIZE = 128
+_GZIP_MIN_SIZE = 1024  # bytes
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_GZIP_HEADERS = {**_JSON_HEADERS, "Content-Encoding": "gzip"}
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _compact(**fields: Any) -> Dict[str, Any]:
+    """Return ``fields`` without the entries whose value is ``None``."""
+
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def _log_background_failure(future: Any) -> None:
+    """Log the error of a fire-and-forget request that nobody may ever await."""
+
+    if not future.cancelled() and future.exception() is not None:
+        _logger.error("Background Dari request failed: %s", future.exception())
+
+
+def _decode_text(response: Response, content: bytes) -> str:
+    return content.decode(response.encoding or "utf-8", errors="replace")
+
+
+def _build_error_message(response: Response) -> str:
+    content = response.content
+    try:
+        data = _json.loads(content)
+    except ValueError:
+        return f"Dari request failed with status {response.status_code}: {_decode_text(response, content)}"
+    if isinstance(data, dict):
+        for key in ("detail", "error", "message"):
+            if key in data and data[key]:
+                return str(data[key])
+    return f"Dari request failed with status {response.status_code}"
+
+
+def _parse_response(response: Response) -> Any:
+    """Decode a successful response body, reading ``response.content`` only once."""
+
+    content = response.content
+    if response.status_code == 204 or not content:
+        return None
+    # The API answers in JSON, so decode first and only consult Content-Type on failure.
+    try:
+        return _json.loads(content)
+    except ValueError as exc:
+        if "application/json" in response.headers.get("Content-Type", ""):
+            raise DariError("Invalid JSON received from Dari", status_code=response.status_code, response=response) from exc
+    return _decode_text(response, content)
 
 
 class DariError(Exception):
-    """Raised when the Dari API returns an error or the request fails."""
+    """Raised when the Dari API returns an error or the request fails.
+
+    When only ``response`` is given, the message is taken from the error body.
+    """
 
-    def __init__(self, message: str, *, status_code: Optional[int] = None, response: Optional[Response] = None) -> None:
-        super().__init__(message)
+    def __init__(
+        self,
+        message: Optional[str] = None,
+        *,
+        status_code: Optional[int] = None,
+        response: Optional[Response] = None,
+    ) -> None:
+        if message is None and response is not None:
+            message = _build_error_message(response)
+        if message is None:
+            super().__init__()
+        else:
+            super().__init__(message)
         self.status_code = status_code
         self.response = response
 
 
 class Dari:
-    """Tiny convenience wrapper around the Dari REST API."""
+    """Tiny convenience wrapper around the Dari REST API.
+
+    Mappings passed to request methods are serialized as-is rather than copied,
+    so they must not be mutated until the call returns.
+
+    GET responses that carry ``ETag``/``Last-Modified`` validators or a
+    ``Cache-Control: max-age`` are kept in an LRU cache of ``cache_size``
+    entries and revalidated with conditional requests. Pass ``cache_size=0``
+    to disable it.
+
+    With ``session_cache_ttl`` set, sessions returned by :meth:`create_session`,
+    :meth:`get_session` and :meth:`update_session` are also remembered by ID
+    for that many seconds, and :meth:`get_session` answers from memory while
+    the entry is fresh. This is off by default because session status changes
+    on the server (for example ``pending`` to ``active``) and polling loops
+    must see it.
+
+    With ``compress_requests=True``, JSON bodies over 1 KiB are sent
+    gzip-compressed. If the server answers ``415`` the body is resent
+    uncompressed and compression stays off for the rest of the client's life.
+
+    With ``prewarm=True``, a background thread opens the connection to
+    ``base_url`` during construction, so the first call skips the TCP and TLS
+    handshake. Requests made before it finishes wait for it rather than open
+    a second connection.
+    """
 
     def __init__(
         self,
@@ -31,18 +141,68 @@ class Dari:
         base_url: str = DEFAULT_BASE_URL,
         timeout: int | float = DEFAULT_TIMEOUT,
         session: Optional[Session] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        compress_requests: bool = False,
+        prewarm: bool = False,
+        session_cache_ttl: Optional[float] = None,
     ) -> None:
         if not api_key:
             raise ValueError("api_key must be provided")
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self._session = session or requests.Session()
-        self._default_headers: Dict[str, str] = {
+        owns_session = session is None
+        default_headers: Dict[str, str] = {
             "X-API-Key": api_key,
             "User-Agent": f"dari-python/{__version__}",
             "Accept": "application/json",
         }
+        if session is None:
+            session = requests.Session()
+            adapter = SharedConnectionPool.get_adapter(self.base_url)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # Our own session carries the defaults, so requests need not repeat them.
+            session.headers.update(default_headers)
+            default_headers = {}
+        self._session = session
+        # Sent with every request on a caller-supplied session, which must not
+        # be modified: its other requests would inherit our API key.
+        self._default_headers = default_headers
+        self._urls: Dict[str, str] = {
+            "credentials": f"{self.base_url}/public/credentials",
+            "connected_accounts": f"{self.base_url}/public/connected-accounts",
+            "phone_numbers": f"{self.base_url}/public/phone-numbers",
+            "browser_profiles": f"{self.base_url}/public/browser-profiles",
+            "run_action": f"{self.base_url}/public/single-actions/run-action",
+            "sessions": f"{self.base_url}/public/sessions",
+        }
+        # Bound str.format methods for the per-resource endpoints.
+        self._url_templates: Dict[str, Callable[..., str]] = {
+            "workflow_start": f"{self.base_url}/public/workflows/start/{{}}".format,
+            "workflow": f"{self.base_url}/public/workflows/{{}}".format,
+            "execution": f"{self.base_url}/public/workflows/{{}}/executions/{{}}".format,
+            "session": f"{self.base_url}/public/sessions/{{}}".format,
+            "session_terminate": f"{self.base_url}/public/sessions/{{}}/terminate".format,
+        }
+        # Prepared-request templates freeze the session's headers, auth and hooks,
+        # so they are only used on the session this client created and controls.
+        self._prepared_cache: Optional[Dict[Tuple[str, str], Tuple[PreparedRequest, Dict[str, Any]]]] = (
+            {} if owns_session else None
+        )
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, Any], Tuple[float, Response]]" = OrderedDict()
+        self._session_cache_ttl = session_cache_ttl
+        self._session_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Guards both caches when the client is shared between threads.
+        self._lock = threading.Lock()
+        self._compress_requests = compress_requests
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._prewarmed = threading.Event()
+        if prewarm:
+            threading.Thread(target=self._prewarm, name="dari-prewarm", daemon=True).start()
+        else:
+            self._prewarmed.set()
 
     # ------------------------------------------------------------------
     # Workflow execution helpers
@@ -83,43 +243,72 @@ class Dari:
             Dict containing workflow_execution_id and status
         """
 
-        payload: Dict[str, Any] = {"input_variables": dict(input_variables)}
-        if timeout_minutes is not None:
-            payload["timeout_minutes"] = timeout_minutes
-        if should_update_cache is not None:
-            payload["should_update_cache"] = should_update_cache
-        if allow_public_live_view is not None:
-            payload["allow_public_live_view"] = allow_public_live_view
-        if browser_profile_id is not None:
-            payload["browser_profile_id"] = browser_profile_id
-        if use_proxy is not None:
-            payload["use_proxy"] = use_proxy
-        if proxy_city is not None:
-            payload["proxy_city"] = proxy_city
-        if proxy_server is not None:
-            payload["proxy_server"] = proxy_server
-        if proxy_server_username is not None:
-            payload["proxy_server_username"] = proxy_server_username
-        if proxy_server_password is not None:
-            payload["proxy_server_password"] = proxy_server_password
-        if user_agent is not None:
-            payload["user_agent"] = user_agent
-        return self._request("POST", f"/public/workflows/start/{workflow_id}", json=payload)
+        payload: Dict[str, Any] = {
+            "input_variables": input_variables,
+            **_compact(
+                timeout_minutes=timeout_minutes,
+                should_update_cache=should_update_cache,
+                allow_public_live_view=allow_public_live_view,
+                browser_profile_id=browser_profile_id,
+                use_proxy=use_proxy,
+                proxy_city=proxy_city,
+                proxy_server=proxy_server,
+                proxy_server_username=proxy_server_username,
+                proxy_server_password=proxy_server_password,
+                user_agent=user_agent,
+            ),
+        }
+        return self._request("POST", self._url_templates["workflow_start"](workflow_id), json=payload, _absolute=True)
 
     def list_workflow_executions(self, workflow_id: str) -> Dict[str, Any]:
         """Return executions for the given workflow."""
 
-        return self._request("GET", f"/public/workflows/{workflow_id}")
+        return self._request("GET", self._url_templates["workflow"](workflow_id), _absolute=True)
+
+    def list_workflow_executions_iter(self, workflow_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield executions for the given workflow while the response downloads.
+
+        Requires the optional ``ijson`` dependency (``pip install "dari-python[stream]"``).
+        """
+
+        return self._stream_items("GET", self._url_templates["workflow"](workflow_id), "executions.item")
 
     def get_execution_details(self, workflow_id: str, execution_id: str) -> Dict[str, Any]:
         """Fetch detailed information about a workflow execution."""
 
-        return self._request("GET", f"/public/workflows/{workflow_id}/executions/{execution_id}")
+        return self._request(
+            "GET", self._url_templates["execution"](workflow_id, execution_id), _absolute=True
+        )
+
+    def get_execution_details_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch several executions concurrently over the shared connection pool.
+
+        Args:
+            pairs: ``(workflow_id, execution_id)`` tuples to fetch
+            max_workers: Number of requests in flight at once. When passing your
+                own ``session``, mount an adapter with ``pool_maxsize`` at least
+                this large or extra connections are discarded after each call.
+
+        Returns:
+            Dict mapping each ``(workflow_id, execution_id)`` pair to its details
+        """
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_execution_details, workflow_id, execution_id): (workflow_id, execution_id)
+                for workflow_id, execution_id in pairs
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
 
     def resume_workflow(self, resume_url: str, variables: Mapping[str, Any]) -> Dict[str, Any]:
         """Resume a paused workflow using the resume URL from a webhook payload."""
 
-        payload = {"variables": dict(variables)}
+        payload = {"variables": variables}
         return self._request("POST", resume_url, json=payload, require_api_key=False)
 
     # ------------------------------------------------------------------
@@ -128,7 +317,7 @@ class Dari:
     def list_credentials(self) -> Any:
         """Return saved browser credentials."""
 
-        return self._request("GET", "/public/credentials")
+        return self._request("GET", self._urls["credentials"], _absolute=True)
 
     def create_credential(
         self,
@@ -142,34 +331,33 @@ class Dari:
     ) -> Dict[str, Any]:
         """Create a new credential with API key authentication."""
 
-        payload: Dict[str, Any] = {"service_name": service_name}
-        if username_or_email is not None:
-            payload["username_or_email"] = username_or_email
-        if password is not None:
-            payload["password"] = password
-        if totp_secret is not None:
-            payload["totp_secret"] = totp_secret
-        if gmail_oauth_account_id is not None:
-            payload["gmail_oauth_account_id"] = gmail_oauth_account_id
-        if phone_number_id is not None:
-            payload["phone_number_id"] = phone_number_id
-        return self._request("POST", "/public/credentials", json=payload)
+        payload: Dict[str, Any] = {
+            "service_name": service_name,
+            **_compact(
+                username_or_email=username_or_email,
+                password=password,
+                totp_secret=totp_secret,
+                gmail_oauth_account_id=gmail_oauth_account_id,
+                phone_number_id=phone_number_id,
+            ),
+        }
+        return self._request("POST", self._urls["credentials"], json=payload, _absolute=True)
 
     def list_connected_accounts(self) -> Any:
         """Return OAuth accounts associated with the workspace."""
 
-        return self._request("GET", "/public/connected-accounts")
+        return self._request("GET", self._urls["connected_accounts"], _absolute=True)
 
     def list_phone_numbers(self) -> Any:
         """Return all phone numbers for the workspace."""
 
-        return self._request("GET", "/public/phone-numbers")
+        return self._request("GET", self._urls["phone_numbers"], _absolute=True)
 
     def purchase_phone_number(self, *, label: str) -> Dict[str, Any]:
         """Purchase a new Twilio phone number for the workspace."""
 
         payload = {"label": label}
-        return self._request("POST", "/public/phone-numbers", json=payload)
+        return self._request("POST", self._urls["phone_numbers"], json=payload, _absolute=True)
 
     def create_browser_profile(
         self,
@@ -187,10 +375,8 @@ class Dari:
             Dict containing id, name, and created_at
         """
 
-        payload: Dict[str, Any] = {"name": name}
-        if provider is not None:
-            payload["provider"] = provider
-        return self._request("POST", "/public/browser-profiles", json=payload)
+        payload: Dict[str, Any] = {"name": name, **_compact(provider=provider)}
+        return self._request("POST", self._urls["browser_profiles"], json=payload, _absolute=True)
 
     def list_browser_profiles(self) -> Dict[str, Any]:
         """Return all browser profiles in the workspace.
@@ -199,7 +385,7 @@ class Dari:
             Dict containing profiles array with id, name, and created_at for each profile
         """
 
-        return self._request("GET", "/public/browser-profiles")
+        return self._request("GET", self._urls["browser_profiles"], _absolute=True)
 
     # ------------------------------------------------------------------
     # Computer use helpers
@@ -230,18 +416,18 @@ class Dari:
 
         payload: Dict[str, Any] = {
             "action": action,
+            **_compact(
+                session_id=session_id,
+                id=id,
+                variables=variables,
+                screen_config=screen_config,
+                set_cache=set_cache,
+            ),
         }
         if session_id is not None:
-            payload["session_id"] = session_id
-        if id is not None:
-            payload["id"] = id
-        if variables is not None:
-            payload["variables"] = dict(variables)
-        if screen_config is not None:
-            payload["screen_config"] = dict(screen_config)
-        if set_cache is not None:
-            payload["set_cache"] = set_cache
-        return self._request("POST", "/public/single-actions/run-action", json=payload, timeout=120)
+            # Actions can change the session (status, expiry), so stop serving it from memory.
+            self._forget_session(session_id)
+        return self._request("POST", self._urls["run_action"], json=payload, timeout=120, _absolute=True)
 
     # ------------------------------------------------------------------
     # Browser session management
@@ -266,28 +452,29 @@ class Dari:
             Dict containing session_id, cdp_url, screen_config, status, expires_at, metadata, created_at, updated_at
         """
 
-        payload: Dict[str, Any] = {}
-        if cdp_url is not None:
-            payload["cdp_url"] = cdp_url
-        if screen_config is not None:
-            payload["screen_config"] = dict(screen_config)
-        if ttl is not None:
-            payload["ttl"] = ttl
-        if metadata is not None:
-            payload["metadata"] = dict(metadata)
-        return self._request("POST", "/public/sessions", json=payload)
-
-    def get_session(self, session_id: str) -> Dict[str, Any]:
+        payload = _compact(cdp_url=cdp_url, screen_config=screen_config, ttl=ttl, metadata=metadata)
+        return self._remember_session(self._request("POST", self._urls["sessions"], json=payload, _absolute=True))
+
+    def get_session(self, session_id: str, *, force_refresh: bool = False) -> Dict[str, Any]:
         """Get details of a specific session.
 
         Args:
             session_id: The session ID to retrieve
+            force_refresh: Skip the local session cache (see ``session_cache_ttl``)
+                and always ask the API.
 
         Returns:
             Dict containing session details
         """
 
-        return self._request("GET", f"/public/sessions/{session_id}")
+        if not force_refresh and self._session_cache_ttl:
+            with self._lock:
+                entry = self._session_cache.get(session_id)
+            if entry is not None and entry[0] > time.monotonic():
+                return copy.deepcopy(entry[1])
+        return self._remember_session(
+            self._request("GET", self._url_templates["session"](session_id), _absolute=True)
+        )
 
     def list_sessions(
         self,
@@ -307,14 +494,25 @@ class Dari:
             Dict containing sessions list and total count
         """
 
-        params: Dict[str, Any] = {}
-        if status_filter is not None:
-            params["status_filter"] = status_filter
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-        return self._request("GET", "/public/sessions", params=params if params else None)
+        params = _compact(status_filter=status_filter, limit=limit, offset=offset)
+        return self._request("GET", self._urls["sessions"], params=params if params else None, _absolute=True)
+
+    def list_sessions_iter(
+        self,
+        *,
+        status_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield sessions one at a time while the response downloads.
+
+        Accepts the same filters as :meth:`list_sessions` but never holds the
+        full listing in memory. Requires the optional ``ijson`` dependency
+        (``pip install "dari-python[stream]"``).
+        """
+
+        params = _compact(status_filter=status_filter, limit=limit, offset=offset)
+        return self._stream_items("GET", self._urls["sessions"], "sessions.item", params=params if params else None)
 
     def update_session(
         self,
@@ -332,23 +530,41 @@ class Dari:
 
         Returns:
             Dict containing updated session details
+
+        Raises:
+            ValueError: If neither ``ttl`` nor ``metadata`` is given
         """
 
-        payload: Dict[str, Any] = {}
-        if ttl is not None:
-            payload["ttl"] = ttl
-        if metadata is not None:
-            payload["metadata"] = dict(metadata)
-        return self._request("PATCH", f"/public/sessions/{session_id}", json=payload)
+        payload = _compact(ttl=ttl, metadata=metadata)
+        if not payload:
+            raise ValueError("update_session requires ttl or metadata")
+        self._forget_session(session_id)
+        return self._remember_session(
+            self._request("PATCH", self._url_templates["session"](session_id), json=payload, _absolute=True)
+        )
 
-    def terminate_session(self, session_id: str) -> None:
+    def terminate_session(self, session_id: str, *, wait: bool = True) -> Optional[Future]:
         """Terminate a session.
 
         Args:
             session_id: The session ID to terminate
+            wait: When False, send the request from a background thread and
+                return immediately; :meth:`close` waits for it to finish.
+                Failures are logged to the ``dari.client`` logger and remain
+                on the returned Future
+
+        Returns:
+            None, or a Future for the request when ``wait`` is False
         """
 
-        self._request("POST", f"/public/sessions/{session_id}/terminate")
+        self._forget_session(session_id)
+        url = self._url_templates["session_terminate"](session_id)
+        if not wait:
+            future = self._background().submit(self._request, "POST", url, _absolute=True)
+            future.add_done_callback(_log_background_failure)
+            return future
+        self._request("POST", url, _absolute=True)
+        return None
 
     def delete_session(self, session_id: str) -> None:
         """Delete a session.
@@ -357,14 +573,25 @@ class Dari:
             session_id: The session ID to delete
         """
 
-        self._request("DELETE", f"/public/sessions/{session_id}")
+        self._forget_session(session_id)
+        self._request("DELETE", self._url_templates["session"](session_id), _absolute=True)
 
     # ------------------------------------------------------------------
     # Session helpers
     # ------------------------------------------------------------------
     def close(self) -> None:
-        """Close the underlying :class:`requests.Session`."""
+        """Wait for background requests, then close the underlying :class:`requests.Session`.
 
+        When the client created its own session, its connections belong to a
+        pool shared by every such client in the process and are left open for
+        reuse; they are closed at interpreter exit. Pass your own ``session``
+        if ``close()`` must release sockets immediately.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
         self._session.close()
 
     def __enter__(self) -> "Dari":
@@ -386,49 +613,222 @@ class Dari:
         headers: Optional[Mapping[str, str]] = None,
         require_api_key: bool = True,
         timeout: Optional[int | float] = None,
+        _absolute: bool = False,
     ) -> Any:
-        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+        if _absolute or path_or_url.startswith(("http://", "https://")):
             url = path_or_url
         else:
             url = f"{self.base_url}{path_or_url}"
-        request_headers: MutableMapping[str, str] = dict(self._default_headers)
+        # Per-call overrides are merged with the defaults in one step and never
+        # mutated afterwards, so caller mappings can be shared as-is.
+        request_headers: Optional[Mapping[str, Optional[str]]] = headers
         if not require_api_key:
-            request_headers.pop("X-API-Key", None)
-        if headers:
-            request_headers.update(headers)
-        if json is not None:
-            request_headers.setdefault("Content-Type", "application/json")
+            # requests drops session headers whose per-request value is None.
+            request_headers = {**(headers or {}), "X-API-Key": None}
+        body = _json.dumps(json) if json is not None else None
+        if timeout is None:
+            timeout = self.timeout
+        cache_key = None
+        cached: Optional[Response] = None
+        validators: Optional[Dict[str, str]] = None
+        if method == "GET" and self._cache_size > 0:
+            cache_key = (url, tuple(sorted(params.items())) if params else None)
+            now = time.monotonic()
+            with self._lock:
+                entry = self._cache.get(cache_key)
+                if entry is not None and entry[0] > now:
+                    self._cache.move_to_end(cache_key)
+            if entry is not None:
+                expires_at, cached = entry
+                if expires_at > now:
+                    return _parse_response(cached)
+                validators = self._validators(cached)
+        extra_headers = validators
+        raw_body = body
+        if body is not None:
+            # Only requests that carry a body are labelled as JSON.
+            extra_headers = _JSON_HEADERS
+            if self._compress_requests and len(body) > _GZIP_MIN_SIZE:
+                body = gzip.compress(body, compresslevel=1)
+                extra_headers = _GZIP_HEADERS
+        response = self._send(method, url, body, params, request_headers, extra_headers, timeout)
+        if response.status_code == 415 and extra_headers is _GZIP_HEADERS:
+            # The server does not accept compressed bodies; resend as-is and stop trying.
+            self._compress_requests = False
+            response = self._send(method, url, raw_body, params, request_headers, _JSON_HEADERS, timeout)
+        if response.status_code == 304 and cached is not None:
+            self._store(cache_key, cached, response)
+            return _parse_response(cached)
+        if response.status_code >= 400:
+            raise DariError(status_code=response.status_code, response=response)
+        if cache_key is not None:
+            self._store(cache_key, response, response)
+        elif method != "GET" and self._cache:
+            # Writes may change anything we have cached; drop it rather than serve stale reads.
+            with self._lock:
+                self._cache.clear()
+        return _parse_response(response)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, Optional[str]]],
+        extra_headers: Optional[Mapping[str, str]],
+        timeout: int | float,
+    ) -> Response:
+        if not self._prewarmed.is_set():
+            self._prewarmed.wait(self.timeout)
         try:
-            response = self._session.request(
+            if params is None and headers is None and self._prepared_cache is not None:
+                return self._send_prepared(method, url, body=body, headers=extra_headers, timeout=timeout)
+            if self._default_headers or extra_headers:
+                headers = {**self._default_headers, **(headers or {}), **(extra_headers or {})}
+            return self._session.request(
                 method,
                 url,
-                json=json,
+                data=body,
                 params=params,
-                headers=request_headers,
-                timeout=timeout if timeout is not None else self.timeout,
+                headers=headers,
+                timeout=timeout,
             )
         except requests.RequestException as exc:  # pragma: no cover - simple passthrough
             raise DariError(str(exc)) from exc
-        if response.status_code >= 400:
-            raise DariError(self._build_error_message(response), status_code=response.status_code, response=response)
-        if response.status_code == 204 or not response.content:
-            return None
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type:
-            try:
-                return response.json()
-            except ValueError as exc:
-                raise DariError("Invalid JSON received from Dari", status_code=response.status_code, response=response) from exc
-        return response.text
+
+    def _send_prepared(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes],
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: int | float,
+    ) -> Response:
+        """Send through a cached :class:`PreparedRequest` template for ``(method, url)``.
+
+        ``Session.request`` re-merges headers, netrc auth and proxy settings on
+        every call; none of that changes for a fixed URL on the session Dari
+        owns, so it is done once. Caller-supplied sessions never come here.
+        """
+
+        key = (method, url)
+        cached = self._prepared_cache.get(key)
+        if cached is None:
+            template = self._session.prepare_request(requests.Request(method, url))
+            template.headers.pop("Cookie", None)
+            settings = self._session.merge_environment_settings(url, {}, None, None, None)
+            cached = (template, settings)
+            with self._lock:
+                if len(self._prepared_cache) >= _PREPARED_CACHE_SIZE:
+                    self._prepared_cache.pop(next(iter(self._prepared_cache)), None)
+                self._prepared_cache[key] = cached
+        template, settings = cached
+        prepared = template.copy()
+        if self._session.cookies:
+            prepared.prepare_cookies(self._session.cookies)
+        if headers:
+            prepared.headers.update(headers)
+        if body is not None:
+            prepared.prepare_body(data=body, files=None)
+        return self._session.send(prepared, timeout=timeout, **settings)
+
+    def _background(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dari-background")
+            return self._executor
+
+    def _prewarm(self) -> None:
+        """Open a pooled connection to ``base_url`` ahead of the first request."""
+
+        try:
+            # Any status will do: the response is discarded and the socket stays in the pool.
+            self._session.head(
+                self.base_url, headers=self._default_headers or None, timeout=self.timeout, allow_redirects=False
+            ).close()
+        except requests.RequestException:
+            pass
+        finally:
+            self._prewarmed.set()
+
+    def _remember_session(self, session: Any) -> Any:
+        if self._session_cache_ttl and self._cache_size > 0 and isinstance(session, dict) and "session_id" in session:
+            # Store a private copy so callers mutating their result cannot change later reads.
+            entry = (time.monotonic() + self._session_cache_ttl, copy.deepcopy(session))
+            with self._lock:
+                self._session_cache[session["session_id"]] = entry
+                self._session_cache.move_to_end(session["session_id"])
+                if len(self._session_cache) > self._cache_size:
+                    self._session_cache.popitem(last=False)
+        return session
+
+    def _forget_session(self, session_id: str) -> None:
+        with self._lock:
+            self._session_cache.pop(session_id, None)
 
     @staticmethod
-    def _build_error_message(response: Response) -> str:
+    def _validators(response: Response) -> Dict[str, str]:
+        validators: Dict[str, str] = {}
+        etag = response.headers.get("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = response.headers.get("Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+    def _store(self, key: Tuple[str, Any], response: Response, fresh: Response) -> None:
+        """Cache ``response`` under ``key`` using the freshness headers of ``fresh``."""
+
+        cache_control = fresh.headers.get("Cache-Control", "")
+        match = _MAX_AGE_RE.search(cache_control)
+        max_age = int(match.group(1)) if match and "no-cache" not in cache_control else 0
+        with self._lock:
+            if "no-store" in cache_control or (max_age == 0 and not self._validators(response)):
+                self._cache.pop(key, None)
+                return
+            self._cache[key] = (time.monotonic() + max_age, response)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _stream_items(
+        self,
+        method: str,
+        url: str,
+        prefix: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[Any]:
+        if ijson is None:
+            raise ImportError('Streaming requires ijson; install it with pip install "dari-python[stream]"')
+        return self._iter_items(method, url, prefix, params)
+
+    def _iter_items(
+        self,
+        method: str,
+        url: str,
+        prefix: str,
+        params: Optional[Mapping[str, Any]],
+    ) -> Iterator[Any]:
         try:
-            data = response.json()
-        except ValueError:
-            return f"Dari request failed with status {response.status_code}: {response.text}"
-        if isinstance(data, dict):
-            for key in ("detail", "error", "message"):
-                if key in data and data[key]:
-                    return str(data[key])
-        return f"Dari request failed with status {response.status_code}"
+            response = self._session.request(
+                method, url, params=params, headers=self._default_headers or None, timeout=self.timeout, stream=True
+            )
+        except requests.RequestException as exc:  # pragma: no cover - simple passthrough
+            raise DariError(str(exc)) from exc
+        with response:
+            if response.status_code >= 400:
+                raise DariError(status_code=response.status_code, response=response)
+            if response.status_code == 204:
+                return
+            # Let urllib3 undo any Content-Encoding so ijson sees plain JSON bytes.
+            response.raw.decode_content = True
+            try:
+                yield from ijson.items(response.raw, prefix, use_float=True)
+            except ijson.JSONError as exc:
+                raise DariError("Invalid JSON received from Dari", status_code=response.status_code, response=response) from exc
+            except _Urllib3HTTPError as exc:
+                raise DariError(str(exc), status_code=response.status_code, response=response) from exc
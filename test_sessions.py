@@ -1,100 +1,151 @@
 """Test script for the new session management features."""
-from dari import Dari
+import asyncio
+import io
+import sys
 
-def main():
-    """Run basic tests with the API."""
-    print("=" * 60)
-    print("Testing Dari Session Management Implementation")
-    print("=" * 60)
-    print()
+from dari import AsyncDari
 
-    # Initialize client
-    api_key = "ck_kZ1WC6vR9H-WjB7zBFtjreJ_4DHyb-ZM3tCrS5wOwEU"
-    client = Dari(api_key=api_key)
-    print("✓ Client initialized successfully")
-    print()
 
-    # Test 1: Create a session
-    print("Test 1: Creating a session...")
+async def run_get_session(client, sid):
+    """Test 2: Get session details."""
+    lines = ["Test 2: Getting session details..."]
     try:
-        session = client.create_session(
-            screen_config={"width": 1280, "height": 720},
-            ttl=3600,
-            metadata={"test": "session_management"}
-        )
-        print(f"✓ Session created: {session['session_id']}")
-        print(f"  Status: {session['status']}")
-        print(f"  Expires at: {session['expires_at']}")
-        print()
+        session_details = await client.get_session(sid)
+        lines.append(f"✓ Retrieved session: {session_details['session_id']}")
+        lines.append(f"  Status: {session_details['status']}")
     except Exception as e:
-        print(f"✗ Failed to create session: {e}")
-        print()
+        lines.append(f"✗ Failed to get session: {e}")
+    lines.append("")
+    return "\n".join(lines)
 
-    # Test 2: Get session details
-    print("Test 2: Getting session details...")
-    try:
-        session_details = client.get_session(session['session_id'])
-        print(f"✓ Retrieved session: {session_details['session_id']}")
-        print(f"  Status: {session_details['status']}")
-        print()
-    except Exception as e:
-        print(f"✗ Failed to get session: {e}")
-        print()
 
-    # Test 3: List sessions
-    print("Test 3: Listing sessions...")
+async def run_list_sessions(client):
+    """Test 3: List sessions."""
+    lines = ["Test 3: Listing sessions..."]
     try:
-        sessions = client.list_sessions(status_filter="active", limit=10)
-        print(f"✓ Found {sessions['total']} active sessions")
-        print()
+        sessions = await client.list_sessions(status_filter="active", limit=10)
+        lines.append(f"✓ Found {sessions['total']} active sessions")
     except Exception as e:
-        print(f"✗ Failed to list sessions: {e}")
-        print()
+        lines.append(f"✗ Failed to list sessions: {e}")
+    lines.append("")
+    return "\n".join(lines)
 
-    # Test 4: Update session
-    print("Test 4: Updating session TTL...")
+
+async def run_update_session(client, sid):
+    """Test 4: Update session."""
+    lines = ["Test 4: Updating session TTL..."]
     try:
-        updated_session = client.update_session(
-            session['session_id'],
+        updated_session = await client.update_session(
+            sid,
             ttl=7200,
             metadata={"test": "updated"}
         )
-        print(f"✓ Session updated")
-        print(f"  New expires at: {updated_session['expires_at']}")
-        print()
+        lines.append("✓ Session updated")
+        lines.append(f"  New expires at: {updated_session['expires_at']}")
     except Exception as e:
-        print(f"✗ Failed to update session: {e}")
-        print()
+        lines.append(f"✗ Failed to update session: {e}")
+    lines.append("")
+    return "\n".join(lines)
+
 
-    # Test 5: Run action with session_id
-    print("Test 5: Running action with session_id...")
+async def run_action(client, sid):
+    """Test 5: Run action with session_id."""
+    lines = []
     try:
-        result = client.run_single_action(
+        result = await client.run_single_action(
             action="What is on the screen?",
-            session_id=session['session_id']
+            session_id=sid
         )
-        print(f"✓ Action executed successfully")
-        print(f"  Success: {result['success']}")
-        print(f"  Result: {result['result'][:100]}..." if len(result['result']) > 100 else f"  Result: {result['result']}")
-        print()
+        lines.append("✓ Action executed successfully")
+        lines.append(f"  Success: {result['success']}")
+        text = result['result']
+        suffix = "..." if len(text) > 100 else ""
+        lines.append(f"  Result: {text[:100]}{suffix}")
     except Exception as e:
-        print(f"Note: Action test skipped - {e}")
-        print("  (This is expected if the session doesn't have a valid browser attached)")
-        print()
+        lines.append(f"Note: Action test skipped - {e}")
+        lines.append("  (This is expected if the session doesn't have a valid browser attached)")
+    lines.append("")
+    return "\n".join(lines)
+
 
-    # Test 6: Terminate session
-    print("Test 6: Terminating session...")
+async def main():
+    """Run basic tests with the API."""
+    # Collect the report and write it once at the end instead of on every line.
+    buf = io.StringIO()
     try:
-        client.terminate_session(session['session_id'])
-        print(f"✓ Session terminated successfully")
-        print()
-    except Exception as e:
-        print(f"✗ Failed to terminate session: {e}")
-        print()
+        await run_tests(buf)
+        print("=" * 60, file=buf)
+        print("Testing complete!", file=buf)
+        print("=" * 60, file=buf)
+    finally:
+        sys.stdout.write(buf.getvalue())
+
+
+async def run_tests(buf):
+    """Run the tests, writing the report to ``buf``."""
+    print("=" * 60, file=buf)
+    print("Testing Dari Session Management Implementation", file=buf)
+    print("=" * 60, file=buf)
+    print(file=buf)
+
+    # Initialize client
+    api_key = "ck_kZ1WC6vR9H-WjB7zBFtjreJ_4DHyb-ZM3tCrS5wOwEU"
+    async with AsyncDari(api_key=api_key) as client:
+        print("✓ Client initialized successfully", file=buf)
+        print(file=buf)
+
+        # Test 1: Create a session
+        print("Test 1: Creating a session...", file=buf)
+        session = None
+        try:
+            session = await client.create_session(
+                screen_config={"width": 1280, "height": 720},
+                ttl=3600,
+                metadata={"test": "session_management"}
+            )
+            print(f"✓ Session created: {session['session_id']}", file=buf)
+            print(f"  Status: {session['status']}", file=buf)
+            print(f"  Expires at: {session['expires_at']}", file=buf)
+            print(file=buf)
+        except Exception as e:
+            print(f"✗ Failed to create session: {e}", file=buf)
+            print(file=buf)
+
+        # Every remaining test needs the session, so stop here without one.
+        if session is None:
+            print("Aborting dependent tests", file=buf)
+            print(file=buf)
+            return
+        sid = session['session_id']
+
+        # Tests 2-4 only depend on the created session, so run them concurrently.
+        reports = await asyncio.gather(
+            run_get_session(client, sid),
+            run_list_sessions(client),
+            run_update_session(client, sid),
+        )
+        for report in reports:
+            print(report, file=buf)
+
+        # Test 5: Run action with session_id
+        print("Test 5: Running action with session_id...", file=buf)
+        # Skip locally when the session reports no browser instead of waiting for
+        # the server to reject the action. Older servers omit the field, so run it.
+        if session.get('browser_attached', True) is False:
+            print("Note: Action test skipped - session has no browser attached", file=buf)
+            print(file=buf)
+        else:
+            print(await run_action(client, sid), file=buf)
 
-    print("=" * 60)
-    print("Testing complete!")
-    print("=" * 60)
+        # Test 6: Terminate session
+        print("Test 6: Terminating session...", file=buf)
+        try:
+            await client.terminate_session(sid)
+            print(f"✓ Session terminated successfully", file=buf)
+            print(file=buf)
+        except Exception as e:
+            print(f"✗ Failed to terminate session: {e}", file=buf)
+            print(file=buf)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
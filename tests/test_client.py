@@ -0,0 +1,545 @@
+"""Offline tests for the Dari clients' transport, caching and helper methods.
+
+Each test talks to a throwaway HTTP server on localhost, so no API key or
+network access is needed.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from dari import Dari, DariError
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import httpx
+
+    from dari.aclient import AsyncDari
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append((self.command, self.path, dict(self.headers), body))
+        status, headers, payload = self.server.responder(self, body)
+        if isinstance(payload, bytes):
+            data = payload
+        else:
+            data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.server.responder = lambda handler, body: (200, {}, {})
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = self.make_client()
+
+    def make_client(self, **kwargs) -> Dari:
+        client = Dari("test-key", base_url=f"http://127.0.0.1:{self.server.server_port}", **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+
+class ConditionalCacheTests(_ServerTestCase):
+    def test_304_revalidation_returns_cached_body(self) -> None:
+        def responder(handler, body):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, None
+            return 200, {"ETag": '"v1"'}, [{"id": "cred-1"}]
+
+        self.server.responder = responder
+
+        first = self.client.list_credentials()
+        second = self.client.list_credentials()
+
+        self.assertEqual(first, [{"id": "cred-1"}])
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("If-None-Match", self.requests[0][2])
+        self.assertEqual(self.requests[1][2]["If-None-Match"], '"v1"')
+
+    def test_cached_body_is_not_shared_with_callers(self) -> None:
+        self.server.responder = lambda handler, body: (200, {"Cache-Control": "max-age=60"}, [{"id": "cred-1"}])
+
+        self.client.list_credentials().append({"id": "mutated"})
+
+        self.assertEqual(self.client.list_credentials(), [{"id": "cred-1"}])
+
+    def test_max_age_serves_locally_until_expiry(self) -> None:
+        self.server.responder = lambda handler, body: (200, {"Cache-Control": "max-age=60"}, [])
+
+        with mock.patch("dari.client.time.monotonic", return_value=1000.0):
+            self.client.list_phone_numbers()
+            self.client.list_phone_numbers()
+        self.assertEqual(len(self.requests), 1)
+
+        with mock.patch("dari.client.time.monotonic", return_value=1061.0):
+            self.client.list_phone_numbers()
+        self.assertEqual(len(self.requests), 2)
+
+    def test_no_store_is_never_cached(self) -> None:
+        self.server.responder = lambda handler, body: (
+            200,
+            {"Cache-Control": "no-store, max-age=60", "ETag": '"v1"'},
+            [],
+        )
+
+        self.client.list_browser_profiles()
+        self.client.list_browser_profiles()
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertNotIn("If-None-Match", self.requests[1][2])
+
+    def test_writes_clear_the_cache(self) -> None:
+        def responder(handler, body):
+            if handler.command == "GET":
+                return 200, {"Cache-Control": "max-age=60"}, []
+            return 200, {}, {"session_id": "s-1", "status": "active"}
+
+        self.server.responder = responder
+        writes = {
+            "POST": lambda: self.client.create_session(ttl=60),
+            "PATCH": lambda: self.client.update_session("s-1", ttl=120),
+            "DELETE": lambda: self.client.delete_session("s-1"),
+        }
+
+        for method, write in writes.items():
+            with self.subTest(method=method):
+                self.client.list_credentials()
+                self.client.list_credentials()
+                gets_before = sum(1 for request in self.requests if request[0] == "GET")
+                write()
+                self.client.list_credentials()
+                gets_after = sum(1 for request in self.requests if request[0] == "GET")
+                self.assertEqual(gets_after, gets_before + 1)
+
+    def test_lru_evicts_the_oldest_entry(self) -> None:
+        self.server.responder = lambda handler, body: (200, {"Cache-Control": "max-age=60"}, [])
+        client = self.make_client(cache_size=2)
+
+        client.list_credentials()
+        client.list_phone_numbers()
+        client.list_credentials()  # refreshes credentials, leaving phone numbers oldest
+        client.list_browser_profiles()  # evicts phone numbers
+        client.list_credentials()
+        client.list_phone_numbers()
+
+        paths = [request[1] for request in self.requests]
+        self.assertEqual(
+            paths,
+            [
+                "/public/credentials",
+                "/public/phone-numbers",
+                "/public/browser-profiles",
+                "/public/phone-numbers",
+            ],
+        )
+
+    def test_cache_size_zero_disables_caching(self) -> None:
+        self.server.responder = lambda handler, body: (200, {"Cache-Control": "max-age=60"}, [])
+        client = self.make_client(cache_size=0)
+
+        client.list_credentials()
+        client.list_credentials()
+
+        self.assertEqual(len(self.requests), 2)
+
+
+class CompressionFallbackTests(_ServerTestCase):
+    def test_415_resends_uncompressed_and_disables_compression(self) -> None:
+        def responder(handler, body):
+            if handler.headers.get("Content-Encoding") == "gzip":
+                return 415, {}, {"detail": "Unsupported Media Type"}
+            return 200, {}, {"session_id": "s-1"}
+
+        self.server.responder = responder
+        client = self.make_client(compress_requests=True)
+        metadata = {"notes": "x" * 4096}
+
+        result = client.create_session(metadata=metadata)
+
+        self.assertEqual(result, {"session_id": "s-1"})
+        self.assertEqual(len(self.requests), 2)
+        compressed, plain = self.requests
+        self.assertEqual(compressed[2]["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(compressed[3])), {"metadata": metadata})
+        self.assertNotIn("Content-Encoding", plain[2])
+        self.assertEqual(plain[2]["Content-Type"], "application/json")
+        self.assertEqual(json.loads(plain[3]), {"metadata": metadata})
+
+        client.create_session(metadata=metadata)
+        self.assertEqual(len(self.requests), 3)
+        self.assertNotIn("Content-Encoding", self.requests[2][2])
+
+    def test_small_bodies_are_not_compressed(self) -> None:
+        self.server.responder = lambda handler, body: (200, {}, {"session_id": "s-1"})
+        client = self.make_client(compress_requests=True)
+
+        client.create_session(ttl=60)
+
+        self.assertNotIn("Content-Encoding", self.requests[0][2])
+
+
+@unittest.skipIf(ijson is None, "streaming needs ijson")
+class StreamingTests(_ServerTestCase):
+    def test_list_sessions_iter_yields_each_session(self) -> None:
+        sessions = [{"session_id": f"s-{i}", "ttl": 1.5} for i in range(3)]
+        self.server.responder = lambda handler, body: (200, {}, {"sessions": sessions, "total": 3})
+
+        items = list(self.client.list_sessions_iter(status_filter="active"))
+
+        self.assertEqual(items, sessions)
+        self.assertEqual(self.requests[0][1], "/public/sessions?status_filter=active")
+
+    def test_list_workflow_executions_iter_decodes_gzip(self) -> None:
+        executions = [{"id": "e-1"}, {"id": "e-2"}]
+        payload = gzip.compress(json.dumps({"executions": executions}).encode())
+        self.server.responder = lambda handler, body: (200, {"Content-Encoding": "gzip"}, payload)
+
+        items = list(self.client.list_workflow_executions_iter("wf-1"))
+
+        self.assertEqual(items, executions)
+        self.assertEqual(self.requests[0][1], "/public/workflows/wf-1")
+
+    def test_error_status_raises_dari_error(self) -> None:
+        self.server.responder = lambda handler, body: (404, {}, {"detail": "Workflow not found"})
+
+        with self.assertRaises(DariError) as ctx:
+            list(self.client.list_workflow_executions_iter("missing"))
+
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual(str(ctx.exception), "Workflow not found")
+
+    def test_invalid_json_raises_dari_error(self) -> None:
+        self.server.responder = lambda handler, body: (200, {}, b'{"sessions": [')
+
+        with self.assertRaises(DariError):
+            list(self.client.list_sessions_iter())
+
+
+class BackgroundTerminateTests(_ServerTestCase):
+    def test_close_waits_for_background_terminate(self) -> None:
+        def responder(handler, body):
+            time.sleep(0.2)
+            return 204, {}, None
+
+        self.server.responder = responder
+
+        future = self.client.terminate_session("s-1", wait=False)
+        self.assertFalse(future.done())
+        self.client.close()
+
+        self.assertTrue(future.done())
+        self.assertIsNone(future.result())
+        self.assertEqual(self.requests[0][:2], ("POST", "/public/sessions/s-1/terminate"))
+
+    def test_background_failure_is_logged_and_kept_on_the_future(self) -> None:
+        self.server.responder = lambda handler, body: (500, {}, {"detail": "terminate failed"})
+
+        with self.assertLogs("dari.client", level="ERROR") as logs:
+            future = self.client.terminate_session("s-1", wait=False)
+            self.client.close()
+
+        self.assertIn("terminate failed", logs.output[0])
+        self.assertIsInstance(future.exception(), DariError)
+        self.assertEqual(future.exception().status_code, 500)
+
+    def test_wait_true_raises_directly(self) -> None:
+        self.server.responder = lambda handler, body: (500, {}, {"detail": "terminate failed"})
+
+        with self.assertRaises(DariError):
+            self.client.terminate_session("s-1")
+
+
+class RetryTests(_ServerTestCase):
+    def test_patch_is_not_retried(self) -> None:
+        self.server.responder = lambda handler, body: (503, {}, {"detail": "busy"})
+
+        with self.assertRaises(DariError) as ctx:
+            self.client.update_session("s-1", ttl=120)
+
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_get_retries_with_capped_retry_after(self) -> None:
+        self.server.responder = lambda handler, body: (503, {"Retry-After": "3600"}, {"detail": "busy"})
+
+        with mock.patch("urllib3.util.retry.time.sleep") as sleep:
+            with self.assertRaises(DariError):
+                self.client.list_credentials()
+
+        self.assertEqual(len(self.requests), 4)
+        self.assertTrue(sleep.call_args_list)
+        self.assertTrue(all(call.args[0] <= 5 for call in sleep.call_args_list))
+
+
+class SessionCacheTests(_ServerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.status = "pending"
+
+        def responder(handler, body):
+            if handler.path.endswith("/run-action"):
+                return 200, {}, {"success": True, "result": "done"}
+            return 200, {}, {"session_id": "s-1", "status": self.status}
+
+        self.server.responder = responder
+
+    def session_gets(self) -> int:
+        return sum(1 for method, path, _, _ in self.requests if method == "GET" and path == "/public/sessions/s-1")
+
+    def test_get_session_asks_the_server_by_default(self) -> None:
+        self.client.create_session(ttl=60)
+        self.status = "active"
+
+        self.assertEqual(self.client.get_session("s-1")["status"], "active")
+        self.assertEqual(self.session_gets(), 1)
+
+    def test_ttl_serves_locally_until_expiry(self) -> None:
+        client = self.make_client(session_cache_ttl=30)
+
+        with mock.patch("dari.client.time.monotonic", return_value=1000.0):
+            client.create_session(ttl=60)
+        self.status = "active"
+        with mock.patch("dari.client.time.monotonic", return_value=1010.0):
+            self.assertEqual(client.get_session("s-1")["status"], "pending")
+        self.assertEqual(self.session_gets(), 0)
+
+        with mock.patch("dari.client.time.monotonic", return_value=1031.0):
+            self.assertEqual(client.get_session("s-1")["status"], "active")
+        self.assertEqual(self.session_gets(), 1)
+
+    def test_run_single_action_invalidates_the_session(self) -> None:
+        client = self.make_client(session_cache_ttl=30)
+        client.create_session(ttl=60)
+        self.status = "active"
+
+        client.run_single_action(action="Click login", session_id="s-1")
+
+        self.assertEqual(client.get_session("s-1")["status"], "active")
+        self.assertEqual(self.session_gets(), 1)
+
+
+@unittest.skipIf(httpx is None, "AsyncDari needs httpx")
+class _AsyncTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs AsyncDari against an in-process httpx.MockTransport."""
+
+    def setUp(self) -> None:
+        self.requests = []
+        self.responder = lambda request: httpx.Response(200, json={})
+
+    def handle(self, request):
+        self.requests.append(request)
+        return self.responder(request)
+
+    async def make_client(self, **kwargs) -> "AsyncDari":
+        transport = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        client = AsyncDari("test-key", base_url="https://dari.test", client=transport, **kwargs)
+        self.addAsyncCleanup(client.aclose)
+        return client
+
+
+class AsyncClientTests(_AsyncTestCase):
+    async def test_caller_client_gets_absolute_urls_and_timeout(self) -> None:
+        client = await self.make_client(timeout=7)
+
+        await client.list_sessions(limit=1)
+
+        request = self.requests[0]
+        self.assertEqual(str(request.url), "https://dari.test/public/sessions?limit=1")
+        self.assertEqual(request.extensions["timeout"], httpx.Timeout(7).as_dict())
+        self.assertEqual(request.headers["X-API-Key"], "test-key")
+        self.assertNotIn("Content-Type", request.headers)
+
+    async def test_per_call_timeout_wins(self) -> None:
+        client = await self.make_client(timeout=5)
+
+        await client.run_single_action(action="Click login")
+
+        self.assertEqual(self.requests[0].extensions["timeout"], httpx.Timeout(120).as_dict())
+
+
+class AsyncBackgroundTerminateTests(_AsyncTestCase):
+    async def test_aclose_waits_and_logs_failures(self) -> None:
+        self.responder = lambda request: httpx.Response(500, json={"detail": "terminate failed"})
+        client = AsyncDari(
+            "test-key",
+            base_url="https://dari.test",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle)),
+        )
+
+        with self.assertLogs("dari.client", level="ERROR") as logs:
+            task = await client.terminate_session("s-1", wait=False)
+            await client.aclose()
+
+        self.assertTrue(task.done())
+        self.assertIsInstance(task.exception(), DariError)
+        self.assertIn("terminate failed", logs.output[0])
+        self.assertEqual(str(self.requests[0].url), "https://dari.test/public/sessions/s-1/terminate")
+
+
+class AsyncListSessionsAllTests(_AsyncTestCase):
+    async def test_fetches_every_page_in_order_within_concurrency(self) -> None:
+        total, server_cap = 237, 50
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            self.requests.append(request)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            offset = int(request.url.params.get("offset", 0))
+            limit = min(int(request.url.params["limit"]), server_cap)
+            sessions = [{"session_id": f"s-{i}"} for i in range(offset, min(offset + limit, total))]
+            return httpx.Response(200, json={"sessions": sessions, "total": total})
+
+        client = AsyncDari(
+            "test-key",
+            base_url="https://dari.test",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        self.addAsyncCleanup(client.aclose)
+
+        sessions = await client.list_sessions_all(status_filter="active", page_size=100, max_concurrency=2)
+
+        self.assertEqual([s["session_id"] for s in sessions], [f"s-{i}" for i in range(total)])
+        self.assertEqual(len(self.requests), 5)
+        self.assertEqual(peak, 2)
+        self.assertTrue(all(r.url.params["status_filter"] == "active" for r in self.requests))
+
+    async def test_single_page_makes_one_request(self) -> None:
+        self.responder = lambda request: httpx.Response(
+            200, json={"sessions": [{"session_id": "s-0"}], "total": 1}
+        )
+        client = await self.make_client()
+
+        self.assertEqual(await client.list_sessions_all(), [{"session_id": "s-0"}])
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_rejects_non_positive_limits(self) -> None:
+        client = await self.make_client()
+
+        with self.assertRaises(ValueError):
+            await client.list_sessions_all(page_size=0)
+        with self.assertRaises(ValueError):
+            await client.list_sessions_all(max_concurrency=0)
+        self.assertEqual(self.requests, [])
+
+
+class AsyncSessionCacheTests(_AsyncTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.status = "pending"
+        self.responder = lambda request: httpx.Response(200, json={"session_id": "s-1", "status": self.status})
+
+    async def test_get_session_asks_the_server_by_default(self) -> None:
+        client = await self.make_client()
+        await client.create_session(ttl=60)
+        self.status = "active"
+
+        self.assertEqual((await client.get_session("s-1"))["status"], "active")
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_ttl_cache_is_dropped_by_run_single_action(self) -> None:
+        client = await self.make_client(session_cache_ttl=30)
+        await client.create_session(ttl=60)
+        self.status = "active"
+
+        self.assertEqual((await client.get_session("s-1"))["status"], "pending")
+        await client.run_single_action(action="Click login", session_id="s-1")
+        self.assertEqual((await client.get_session("s-1"))["status"], "active")
+        self.assertEqual(len(self.requests), 3)
+
+
+class _BodySignature(requests.auth.AuthBase):
+    def __call__(self, request):
+        request.headers["X-Signature"] = hashlib.sha256(request.body or b"").hexdigest()
+        return request
+
+
+class CallerSessionTests(_ServerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+        self.caller_client = self.make_client(session=self.session)
+
+    def test_caller_session_headers_are_left_untouched(self) -> None:
+        self.caller_client.list_credentials()
+
+        self.assertNotIn("X-API-Key", self.session.headers)
+        self.assertEqual(self.requests[0][2]["X-API-Key"], "test-key")
+
+    def test_later_header_changes_are_sent(self) -> None:
+        self.caller_client.list_credentials()
+        self.session.headers["Authorization"] = "Bearer later"
+        self.caller_client.list_credentials()
+
+        self.assertNotIn("Authorization", self.requests[0][2])
+        self.assertEqual(self.requests[1][2]["Authorization"], "Bearer later")
+
+    def test_later_auth_changes_are_sent(self) -> None:
+        self.session.auth = ("user", "p1")
+        self.caller_client.list_phone_numbers()
+        self.session.auth = ("user", "p2")
+        self.caller_client.list_phone_numbers()
+        self.caller_client.list_sessions(limit=1)
+
+        expected = "Basic " + base64.b64encode(b"user:p2").decode()
+        self.assertEqual(self.requests[1][2]["Authorization"], expected)
+        self.assertEqual(self.requests[2][2]["Authorization"], expected)
+
+    def test_body_signing_auth_sees_each_body(self) -> None:
+        self.session.auth = _BodySignature()
+
+        self.caller_client.create_session(ttl=60)
+        self.caller_client.create_session(ttl=120)
+
+        for _, _, headers, body in self.requests:
+            self.assertEqual(headers["X-Signature"], hashlib.sha256(body).hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()